@@ -1,7 +1,7 @@
 """
 Analytics API endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, Request, HTTPException, Depends
 from typing import Dict, Any, List
 import logging
 
@@ -12,9 +12,9 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-def get_supabase() -> SupabaseService:
-    """Dependency to get Supabase service"""
-    return SupabaseService()
+def get_supabase(request: Request) -> SupabaseService:
+    """Dependency to get the Supabase service created at startup"""
+    return request.app.state.supabase
 
 
 @router.get("/dashboard", response_model=AnalyticsResponse)
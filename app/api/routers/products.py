@@ -1,7 +1,7 @@
 """
 Products API endpoints
 """
-from fastapi import APIRouter, Query, HTTPException, Depends
+from fastapi import APIRouter, Request, Query, HTTPException, Depends
 from typing import Optional, List
 import logging
 
@@ -11,14 +11,15 @@ from app.api.models import (
     ProductResponse
 )
 from app.services.supabase_service import SupabaseService
+from app.core.scraper import HomeProScraper
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-def get_supabase() -> SupabaseService:
-    """Dependency to get Supabase service"""
-    return SupabaseService()
+def get_supabase(request: Request) -> SupabaseService:
+    """Dependency to get the Supabase service created at startup"""
+    return request.app.state.supabase
 
 
 @router.post("/search", response_model=ProductSearchResponse)
@@ -198,9 +199,6 @@ async def rescrape_product(
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
         
-        # Import scraper
-        from app.core.scraper import HomeProScraper
-        
         # Create scrape job
         job = await supabase.create_scrape_job(
             job_type='product',
@@ -1,7 +1,7 @@
 """
 Scraping API endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, Request, HTTPException, Depends, BackgroundTasks
 from typing import Optional, List
 import logging
 import asyncio
@@ -19,9 +19,9 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-def get_supabase() -> SupabaseService:
-    """Dependency to get Supabase service"""
-    return SupabaseService()
+def get_supabase(request: Request) -> SupabaseService:
+    """Dependency to get the Supabase service created at startup"""
+    return request.app.state.supabase
 
 
 async def run_scraping_job(job_id: str, job_type: str, target_url: str, urls: List[str] = None, max_pages: int = 5):
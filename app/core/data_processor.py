@@ -2,6 +2,8 @@
 Data processing and validation pipeline
 """
 import re
+import hashlib
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from decimal import Decimal
 import logging
@@ -9,6 +11,99 @@ from app.models.product import Product
 
 logger = logging.getLogger(__name__)
 
+# Thai baht symbol, commas, whitespace and the word "บาท" (baht), stripped in one pass
+PRICE_NOISE_RE = re.compile(r'[฿,\s]|บาท')
+PRICE_NUMBER_RE = re.compile(r'(\d+(?:\.\d{1,2})?)')
+DIGIT_RE = re.compile(r'\d')
+
+WHITESPACE_RE = re.compile(r'\s+')
+CONTROL_CHARS_RE = re.compile(r'[\x00-\x1f\x7f-\x9f]')
+
+# Common SKU patterns, tried in order
+# Example: 1000012345, SKU-12345, PROD_12345
+SKU_PATTERNS = (
+    re.compile(r'(?:SKU|รหัส|Code)[\s:-]*([A-Z0-9-]+)', re.IGNORECASE),
+    re.compile(r'\b(\d{10})\b', re.IGNORECASE),  # 10-digit code
+    re.compile(r'\b([A-Z]{2,5}-?\d{4,})\b', re.IGNORECASE)  # Letter-number combination
+)
+
+# HomePro product ID in URL (e.g., /p/1243357)
+PRODUCT_ID_RE = re.compile(r'/p/(\d+)')
+
+# Current and original price after the "มีคนซื้อไปแล้ว" (people have bought) section
+BOUGHT_SECTION_PRICES_RE = re.compile(r'มีคนซื้อไปแล้ว.*?฿(\d+(?:,\d+)*)\s*/each\s*฿(\d+(?:,\d+)*)', re.DOTALL)
+# Thai Baht prices in markdown (฿2,490 format)
+BAHT_PRICE_RE = re.compile(r'฿\s*([\d,]+)')
+
+# Thai and English availability patterns, checked in order (in-stock wins)
+IN_STOCK_PATTERNS = (
+    'in stock', 'available', 'มีสินค้า', 'พร้อมส่ง',
+    'ready', 'in-stock', 'สินค้าพร้อม'
+)
+
+OUT_OF_STOCK_PATTERNS = (
+    'out of stock', 'unavailable', 'หมด', 'สินค้าหมด',
+    'sold out', 'ไม่มีสินค้า', 'out-of-stock'
+)
+
+# Each table as one alternation, so a status string is scanned once per table
+# instead of once per pattern
+IN_STOCK_RE = re.compile('|'.join(map(re.escape, IN_STOCK_PATTERNS)))
+OUT_OF_STOCK_RE = re.compile('|'.join(map(re.escape, OUT_OF_STOCK_PATTERNS)))
+
+
+# The same price, code and stock strings recur across a catalog, so the string
+# parsers below are cached per input string. Longer inputs (e.g. whole markdown
+# pages) are unique per product and would only pin memory, so the DataProcessor
+# wrappers call the uncached parsers for them.
+CACHED_TEXT_MAX_LEN = 256
+
+
+def _find_price(price_str: str) -> Optional[Decimal]:
+    """Parse the first number in a price string"""
+    # No digits means no price; skip the noise stripping and number search
+    if not DIGIT_RE.search(price_str):
+        return None
+    
+    # Remove common patterns
+    price_str = PRICE_NOISE_RE.sub('', price_str)
+    
+    # Extract first number pattern
+    match = PRICE_NUMBER_RE.search(price_str)
+    if match:
+        try:
+            return Decimal(match.group(1))
+        except:
+            return None
+    return None
+
+
+def _find_sku(text: str) -> Optional[str]:
+    """Find the first SKU/product code in a string"""
+    # Look for common SKU patterns
+    for pattern in SKU_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return match.group(1).upper()
+    
+    return None
+
+
+def _find_availability(text: str) -> str:
+    """Classify a lower-cased stock status string"""
+    if IN_STOCK_RE.search(text):
+        return "in_stock"
+    
+    if OUT_OF_STOCK_RE.search(text):
+        return "out_of_stock"
+    
+    return "unknown"
+
+
+_parse_price = lru_cache(maxsize=4096)(_find_price)
+_parse_sku = lru_cache(maxsize=4096)(_find_sku)
+_parse_availability = lru_cache(maxsize=4096)(_find_availability)
+
 
 class DataProcessor:
     """Process and validate scraped data"""
@@ -19,21 +114,10 @@ class DataProcessor:
         if not price_text:
             return None
             
-        # Convert to string and remove common patterns
         price_str = str(price_text)
-        # Remove Thai baht symbol, commas, spaces
-        price_str = re.sub(r'[฿,\s]', '', price_str)
-        # Remove "บาท" (baht in Thai)
-        price_str = re.sub(r'บาท', '', price_str)
-        
-        # Extract first number pattern
-        match = re.search(r'(\d+(?:\.\d{1,2})?)', price_str)
-        if match:
-            try:
-                return Decimal(match.group(1))
-            except:
-                return None
-        return None
+        if len(price_str) > CACHED_TEXT_MAX_LEN:
+            return _find_price(price_str)
+        return _parse_price(price_str)
     
     @staticmethod
     def clean_text(text: Any) -> str:
@@ -44,9 +128,9 @@ class DataProcessor:
         # Convert to string and strip whitespace
         text = str(text).strip()
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_RE.sub(' ', text)
         # Remove control characters
-        text = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', text)
+        text = CONTROL_CHARS_RE.sub('', text)
         
         return text
     
@@ -57,20 +141,9 @@ class DataProcessor:
             return None
             
         text = str(text)
-        # Look for common SKU patterns
-        # Example: 1000012345, SKU-12345, PROD_12345
-        patterns = [
-            r'(?:SKU|รหัส|Code)[\s:-]*([A-Z0-9-]+)',
-            r'\b(\d{10})\b',  # 10-digit code
-            r'\b([A-Z]{2,5}-?\d{4,})\b'  # Letter-number combination
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).upper()
-        
-        return None
+        if len(text) > CACHED_TEXT_MAX_LEN:
+            return _find_sku(text)
+        return _parse_sku(text)
     
     @staticmethod
     def process_images(images: Any) -> List[str]:
@@ -106,27 +179,9 @@ class DataProcessor:
             return "unknown"
         
         text = str(text).lower()
-        
-        # Thai and English availability patterns
-        in_stock_patterns = [
-            'in stock', 'available', 'มีสินค้า', 'พร้อมส่ง',
-            'ready', 'in-stock', 'สินค้าพร้อม'
-        ]
-        
-        out_of_stock_patterns = [
-            'out of stock', 'unavailable', 'หมด', 'สินค้าหมด',
-            'sold out', 'ไม่มีสินค้า', 'out-of-stock'
-        ]
-        
-        for pattern in in_stock_patterns:
-            if pattern in text:
-                return "in_stock"
-        
-        for pattern in out_of_stock_patterns:
-            if pattern in text:
-                return "out_of_stock"
-        
-        return "unknown"
+        if len(text) > CACHED_TEXT_MAX_LEN:
+            return _find_availability(text)
+        return _parse_availability(text)
     
     def process_product_data(self, raw_data: Dict[str, Any], url: str) -> Optional[Product]:
         """
@@ -175,7 +230,7 @@ class DataProcessor:
             # Extract SKU - HomePro uses product ID in URL
             sku = None
             # Try to extract from URL first (e.g., /p/1243357)
-            url_match = re.search(r'/p/(\d+)', url)
+            url_match = PRODUCT_ID_RE.search(url)
             if url_match:
                 sku = url_match.group(1)
             
@@ -187,7 +242,6 @@ class DataProcessor:
             
             if not sku:
                 # Generate SKU from URL hash
-                import hashlib
                 sku = f"HP-{hashlib.md5(url.encode()).hexdigest()[:8].upper()}"
             
             # Process prices - look in markdown for Thai Baht prices
@@ -197,14 +251,14 @@ class DataProcessor:
             if markdown:
                 # Look for price pattern near "มีคนซื้อไปแล้ว" (people have bought) section
                 # This section typically contains the actual selling price
-                bought_section = re.search(r'มีคนซื้อไปแล้ว.*?฿(\d+(?:,\d+)*)\s*/each\s*฿(\d+(?:,\d+)*)', markdown, re.DOTALL)
+                bought_section = BOUGHT_SECTION_PRICES_RE.search(markdown)
                 if bought_section:
                     # First price after "มีคนซื้อไปแล้ว" is current price, second is original
                     current_price = self.extract_price(bought_section.group(1))
                     original_price = self.extract_price(bought_section.group(2))
                 else:
                     # Fallback: Find prices in markdown (฿2,490 format)
-                    price_matches = re.findall(r'฿\s*([\d,]+)', markdown)
+                    price_matches = BAHT_PRICE_RE.findall(markdown)
                     if price_matches:
                         # Look for a pattern where two prices appear close together
                         # The smaller one is likely the sale price
@@ -8,6 +8,7 @@ import logging
 from app.services.firecrawl_client import FirecrawlClient
 from app.services.supabase_service import SupabaseService
 from app.core.data_processor import DataProcessor
+from app.core.url_discovery import URLDiscovery
 
 logger = logging.getLogger(__name__)
 
@@ -74,8 +75,6 @@ class HomeProScraper:
             List of discovered product URLs
         """
         try:
-            from app.core.url_discovery import URLDiscovery
-            
             discovery = URLDiscovery()
             try:
                 product_urls = await discovery.discover_from_category(start_url, max_pages)
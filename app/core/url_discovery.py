@@ -1,13 +1,17 @@
 """
 URL discovery module for finding product URLs from category pages
 """
+import asyncio
 import re
 import logging
-from typing import List, Set
-from app.services.firecrawl_client import FirecrawlClient
+from typing import Any, Dict, List, Set
+from app.services.firecrawl_client import FirecrawlClient, PRODUCT_HREF_RE
 
 logger = logging.getLogger(__name__)
 
+# Common pagination patterns: ?page=2, &page=2, /page/2
+PAGINATION_HREF_RE = re.compile(r'href=["\']([^"\']*?page[=/]\d+[^"\']*?)["\']', re.IGNORECASE)
+
 
 class URLDiscovery:
     """Discover product URLs from category and search pages"""
@@ -47,15 +51,31 @@ class URLDiscovery:
             if max_pages > 1:
                 pagination_urls = self._find_pagination_urls(category_data, category_url)
                 
-                # Scrape additional pages
-                for i, page_url in enumerate(pagination_urls[:max_pages-1]):
-                    logger.info(f"Checking page {i+2}: {page_url}")
-                    page_data = await self.client.scrape(page_url)
+                # Scrape additional pages concurrently; the client's rate limiter still applies
+                page_urls = pagination_urls[:max_pages-1]
+                if page_urls:
+                    logger.info(f"Checking {len(page_urls)} additional pages")
+                    # Same concurrency cap as batch_scrape, but gathered here since
+                    # batch_scrape drops failed pages and results could no longer be
+                    # matched to their page URL
+                    semaphore = asyncio.Semaphore(5)
+                    
+                    async def scrape_page(page_url: str) -> Dict[str, Any]:
+                        async with semaphore:
+                            return await self.client.scrape(page_url)
                     
-                    if page_data:
-                        page_products = self._extract_product_urls(page_data)
-                        self.discovered_urls.update(page_products)
-                        logger.info(f"Found {len(page_products)} products on page {i+2}")
+                    pages = await asyncio.gather(
+                        *(scrape_page(page_url) for page_url in page_urls),
+                        return_exceptions=True
+                    )
+                    
+                    for i, (page_url, page_data) in enumerate(zip(page_urls, pages), start=2):
+                        if isinstance(page_data, BaseException):
+                            logger.error(f"Failed to scrape page {i}: {page_url} - {str(page_data)}")
+                        elif page_data:
+                            page_products = self._extract_product_urls(page_data)
+                            self.discovered_urls.update(page_products)
+                            logger.info(f"Found {len(page_products)} products on page {i}: {page_url}")
             
             return list(self.discovered_urls)
             
@@ -70,58 +90,52 @@ class URLDiscovery:
         # Check HTML content
         html = page_data.get('html', '')
         if html:
-            # Find all product links
-            product_links = re.findall(r'href=["\']([^"\']*?/p/\d+[^"\']*?)["\']', html)
-            
-            for link in product_links:
+            # Find all product links, streaming matches instead of building a list
+            for match in PRODUCT_HREF_RE.finditer(html):
+                link = match.group(1)
                 if link.startswith('http'):
                     urls.append(link)
                 elif link.startswith('/'):
                     urls.append(f"https://www.homepro.co.th{link}")
         
-        # Also check linksOnPage
+        # Also check linksOnPage (duplicates are dropped below)
         links_on_page = page_data.get('linksOnPage', [])
         for link in links_on_page:
             if isinstance(link, str) and '/p/' in link:
-                if link not in urls:
-                    urls.append(link)
+                urls.append(link)
         
-        # Clean and deduplicate
+        # Clean and deduplicate, keeping first-seen order
+        seen = set()
         clean_urls = []
         for url in urls:
             # Remove query parameters and fragments
             clean_url = url.split('?')[0].split('#')[0]
-            if clean_url not in clean_urls and '/p/' in clean_url:
+            if clean_url not in seen and '/p/' in clean_url:
+                seen.add(clean_url)
                 clean_urls.append(clean_url)
         
         return clean_urls
     
     def _find_pagination_urls(self, page_data: dict, base_url: str) -> List[str]:
         """Find pagination URLs from the page"""
-        pagination_urls = []
-        
         html = page_data.get('html', '')
         if not html:
-            return pagination_urls
+            return []
         
-        # Common pagination patterns
-        # ?page=2, &page=2, /page/2
-        page_links = re.findall(r'href=["\']([^"\']*?(?:page[=/]\d+|page=\d+)[^"\']*?)["\']', html, re.IGNORECASE)
+        # Collect straight into a set to deduplicate as matches are produced
+        pagination_urls: Set[str] = set()
         
-        for link in page_links:
+        for match in PAGINATION_HREF_RE.finditer(html):
+            link = match.group(1)
             if link.startswith('http'):
-                pagination_urls.append(link)
+                pagination_urls.add(link)
             elif link.startswith('/'):
-                pagination_urls.append(f"https://www.homepro.co.th{link}")
+                pagination_urls.add(f"https://www.homepro.co.th{link}")
             elif link.startswith('?'):
                 # Append to base URL
-                pagination_urls.append(base_url + link)
-        
-        # Deduplicate and sort
-        unique_urls = list(set(pagination_urls))
-        unique_urls.sort()
+                pagination_urls.add(base_url + link)
         
-        return unique_urls
+        return sorted(pagination_urls)
     
     async def discover_from_search(self, search_query: str, max_results: int = 50) -> List[str]:
         """
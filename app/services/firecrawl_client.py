@@ -3,52 +3,82 @@ Firecrawl API client with rate limiting and retry logic
 """
 import asyncio
 import httpx
+import json
 import re
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from collections import deque
+from typing import Callable, Dict, List, Optional, Any
 import logging
 from config import get_settings
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
+
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+    _http2 = True
+except ImportError:  # h2 is optional; httpx falls back to HTTP/1.1 keep-alive
+    _http2 = False
+
 logger = logging.getLogger(__name__)
 
+# Product links in HTML, e.g. href="/p/1243357" (HomePro uses /p/[number])
+PRODUCT_HREF_RE = re.compile(r'href=["\']([^"\']*?/p/\d+[^"\']*?)["\']')
+
 
 class RateLimiter:
     """Simple rate limiter for API calls"""
     
     def __init__(self, calls_per_minute: int = 30):
         self.calls_per_minute = calls_per_minute
-        self.calls = []
-        self.lock = asyncio.Lock()
+        self.window = 60.0  # seconds
+        self.calls = deque()  # call timestamps, oldest first
     
     async def acquire(self):
         """Wait if necessary to respect rate limits"""
-        async with self.lock:
-            now = datetime.now()
-            # Remove calls older than 1 minute
-            self.calls = [call for call in self.calls if now - call < timedelta(minutes=1)]
+        while True:
+            # No await between the check and the append, so this is atomic on
+            # the event loop and needs no lock
+            now = asyncio.get_running_loop().time()
+            cutoff = now - self.window
+            # Remove calls older than 1 minute; timestamps are appended in order
+            # so expired ones are always at the front
+            while self.calls and self.calls[0] <= cutoff:
+                self.calls.popleft()
             
-            if len(self.calls) >= self.calls_per_minute:
-                # Wait until the oldest call is 1 minute old
-                wait_time = 60 - (now - self.calls[0]).total_seconds()
-                if wait_time > 0:
-                    logger.info(f"Rate limit reached, waiting {wait_time:.1f}s")
-                    await asyncio.sleep(wait_time)
-                    self.calls.pop(0)
+            if len(self.calls) < self.calls_per_minute:
+                self.calls.append(now)
+                return
             
-            self.calls.append(now)
+            # Wait until the oldest call is 1 minute old, then re-check since
+            # another waiter may have taken the free slot
+            wait_time = self.calls[0] - cutoff
+            logger.info(f"Rate limit reached, waiting {wait_time:.1f}s")
+            await asyncio.sleep(wait_time)
 
 
 class FirecrawlClient:
     """Client for Firecrawl API with retry logic and rate limiting"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        json_loads: Optional[Callable[[bytes], Any]] = None
+    ):
         settings = get_settings()
         self.api_key = api_key or settings.firecrawl_api_key
+        # Scrape payloads carry full page markdown/html, so decode with orjson when available
+        self.json_loads = json_loads or _json_loads
         self.base_url = "https://api.firecrawl.dev/v0"
         self.rate_limiter = RateLimiter(calls_per_minute=30)
+        # One pooled client per instance; concurrent batch_scrape requests share
+        # keep-alive connections (multiplexed over HTTP/2 when h2 is installed)
         self.client = httpx.AsyncClient(
             headers={"Authorization": f"Bearer {self.api_key}"},
-            timeout=30.0
+            timeout=30.0,
+            http2=_http2
         )
     
     async def __aenter__(self):
@@ -88,7 +118,7 @@ class FirecrawlClient:
                 )
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = self.json_loads(response.content)
                     logger.info(f"Successfully scraped: {url}")
                     scraped_data = data.get("data", {})
                     
@@ -151,7 +181,7 @@ class FirecrawlClient:
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = self.json_loads(response.content)
                 job_id = data.get("jobId")
                 
                 # Poll for completion
@@ -166,22 +196,33 @@ class FirecrawlClient:
     
     async def _poll_crawl_job(self, job_id: str, timeout: int = 300) -> List[str]:
         """Poll crawl job status until completion"""
-        start_time = datetime.now()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        
+        # Short crawls often finish within a few seconds, so start polling
+        # quickly and back off towards the 5s interval for longer jobs
+        delay = 1.0
+        wait = delay
         
-        while (datetime.now() - start_time).total_seconds() < timeout:
-            await asyncio.sleep(5)  # Check every 5 seconds
+        while loop.time() < deadline:
+            # Never sleep past the deadline, whatever the server asked for
+            await asyncio.sleep(min(wait, deadline - loop.time()))
+            delay = min(delay * 1.5, 5.0)
+            wait = delay
             
             try:
                 response = await self.client.get(f"{self.base_url}/crawl/status/{job_id}")
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = self.json_loads(response.content)
                     status = data.get("status")
                     
                     if status == "completed":
                         # Handle different response formats
                         crawl_data = data.get("data", [])
                         urls = []
+                        # Mirrors urls for O(1) membership checks when merging HTML links
+                        seen = set()
                         logger.info(f"Crawl completed with {len(crawl_data)} items")
                         
                         for item in crawl_data:
@@ -203,6 +244,7 @@ class FirecrawlClient:
                                 
                                 if url:
                                     urls.append(url)
+                                    seen.add(url)
                                     logger.info(f"Found URL from metadata: {url}")
                                     
                                 # Also extract links from linksOnPage
@@ -221,32 +263,48 @@ class FirecrawlClient:
                                 if product_links:
                                     logger.info(f"Found {len(product_links)} product links from linksOnPage")
                                     urls.extend(product_links)
+                                    seen.update(product_links)
                                 
                                 # Also check HTML content for product links
                                 html_content = item.get("html", "")
                                 if html_content:
                                     # Extract product links from HTML
-                                    html_product_links = re.findall(r'href=["\']([^"\']*?/p/\d+[^"\']*?)["\']', html_content)
+                                    html_product_links = PRODUCT_HREF_RE.findall(html_content)
                                     for link in html_product_links:
                                         if link.startswith('http'):
-                                            if link not in urls:
+                                            if link not in seen:
                                                 urls.append(link)
+                                                seen.add(link)
                                         elif link.startswith('/'):
                                             full_link = f"https://www.homepro.co.th{link}"
-                                            if full_link not in urls:
+                                            if full_link not in seen:
                                                 urls.append(full_link)
+                                                seen.add(full_link)
                                     
                                     if html_product_links:
                                         logger.info(f"Found {len(html_product_links)} additional product links from HTML")
                                             
                             elif isinstance(item, str):
                                 urls.append(item)
+                                seen.add(item)
                         
                         logger.info(f"Extracted {len(urls)} URLs from crawl")
                         return urls
                     elif status == "failed":
                         logger.error(f"Crawl job failed: {job_id}")
                         return []
+                elif response.status_code == 429:
+                    # Rate limit hit, wait at least as long as the server asks before the
+                    # next check, but never less than the backoff delay. Retry-After may
+                    # also be an HTTP date; anything that isn't a usable number of seconds
+                    # falls back to the backoff delay
+                    try:
+                        wait = float(response.headers.get("Retry-After", delay))
+                    except ValueError:
+                        wait = delay
+                    if not wait >= delay:  # shorter than the backoff, negative or NaN
+                        wait = delay
+                    logger.warning(f"Rate limit hit while polling, waiting {wait:.1f}s")
                         
             except Exception as e:
                 logger.error(f"Poll error: {str(e)}")
@@ -2,6 +2,7 @@
 Secure configuration management for HomePro Scraper
 """
 import os
+from functools import lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
@@ -47,8 +48,9 @@ class Settings(BaseSettings):
     }
 
 
+@lru_cache()
 def get_settings() -> Settings:
-    """Get validated settings instance"""
+    """Get validated settings instance (read from the environment once per process)"""
     return Settings()
 
 
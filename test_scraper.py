@@ -3,10 +3,6 @@
 Quick test script for HomePro scraper
 """
 import asyncio
-import sys
-from pathlib import Path
-
-sys.path.append(str(Path(__file__).parent))
 
 from app.core.scraper import HomeProScraper
 from app.services.supabase_service import SupabaseService